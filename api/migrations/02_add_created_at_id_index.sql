@@ -0,0 +1,4 @@
+-- Supports keyset pagination on (created_at DESC, id DESC) for the list endpoint
+DROP INDEX IF EXISTS idx_created_at;
+
+CREATE INDEX idx_todos_created_at_id ON todos(created_at DESC, id DESC);
@@ -0,0 +1,3 @@
+-- Time-ordered ids append to the right edge of the primary key index
+-- instead of landing on random leaf pages (uuidv7() requires PostgreSQL 18)
+ALTER TABLE todos ALTER COLUMN id SET DEFAULT uuidv7();
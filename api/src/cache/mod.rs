@@ -0,0 +1,129 @@
+use actix_web::web::Bytes;
+use std::collections::HashMap;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::RwLock;
+use std::time::{Duration, Instant};
+
+/// Serialized first pages of `GET /api/todos`, keyed by page size and shared by all workers.
+///
+/// Every write bumps the version. Entries are tagged with the version that was
+/// current before their query ran, so a page computed concurrently with a write
+/// is never served afterwards. The TTL bounds staleness across API instances,
+/// which do not see each other's writes.
+pub struct TodoListCache {
+    ttl: Duration,
+    version: AtomicU64,
+    pages: RwLock<HashMap<i64, CachedPage>>,
+}
+
+struct CachedPage {
+    version: u64,
+    stored_at: Instant,
+    body: Bytes,
+}
+
+impl TodoListCache {
+    pub fn new(ttl: Duration) -> Self {
+        TodoListCache {
+            ttl,
+            version: AtomicU64::new(0),
+            pages: RwLock::new(HashMap::new()),
+        }
+    }
+
+    /// Current version, to be read before querying the database
+    pub fn version(&self) -> u64 {
+        self.version.load(Ordering::Acquire)
+    }
+
+    pub fn get(&self, limit: i64) -> Option<Bytes> {
+        let version = self.version();
+        let pages = self.pages.read().ok()?;
+
+        pages
+            .get(&limit)
+            .filter(|page| page.version == version && page.stored_at.elapsed() < self.ttl)
+            .map(|page| page.body.clone())
+    }
+
+    /// Store a page computed at `version`, unless a write has happened since;
+    /// a slow reader must not replace a fresher page stored by a later one
+    pub fn store(&self, limit: i64, version: u64, body: Bytes) {
+        if version != self.version() {
+            return;
+        }
+
+        if let Ok(mut pages) = self.pages.write() {
+            if pages.get(&limit).map_or(false, |page| page.version > version) {
+                return;
+            }
+
+            pages.insert(limit, CachedPage {
+                version,
+                stored_at: Instant::now(),
+                body,
+            });
+        }
+    }
+
+    /// Discard every cached page; called after each successful write
+    pub fn invalidate(&self) {
+        self.version.fetch_add(1, Ordering::AcqRel);
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn cache() -> TodoListCache {
+        TodoListCache::new(Duration::from_secs(60))
+    }
+
+    #[test]
+    fn serves_stored_page_for_its_limit_only() {
+        let cache = cache();
+        cache.store(50, cache.version(), Bytes::from_static(b"page"));
+
+        assert_eq!(cache.get(50), Some(Bytes::from_static(b"page")));
+        assert_eq!(cache.get(100), None);
+    }
+
+    #[test]
+    fn invalidate_discards_stored_pages() {
+        let cache = cache();
+        cache.store(50, cache.version(), Bytes::from_static(b"page"));
+        cache.invalidate();
+
+        assert_eq!(cache.get(50), None);
+    }
+
+    #[test]
+    fn page_computed_before_a_write_is_not_stored() {
+        let cache = cache();
+        let version = cache.version();
+        cache.invalidate();
+        cache.store(50, version, Bytes::from_static(b"stale"));
+
+        assert_eq!(cache.get(50), None);
+    }
+
+    #[test]
+    fn slow_reader_does_not_replace_fresher_page() {
+        let cache = cache();
+        let old_version = cache.version();
+        cache.invalidate();
+        cache.store(50, cache.version(), Bytes::from_static(b"fresh"));
+        cache.store(50, old_version, Bytes::from_static(b"stale"));
+
+        assert_eq!(cache.get(50), Some(Bytes::from_static(b"fresh")));
+    }
+
+    #[test]
+    fn expired_page_is_not_served() {
+        let cache = TodoListCache::new(Duration::ZERO);
+        cache.store(50, cache.version(), Bytes::from_static(b"page"));
+
+        assert_eq!(cache.get(50), None);
+    }
+}
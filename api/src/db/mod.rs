@@ -1,14 +1,41 @@
-use sqlx::postgres::PgPoolOptions;
+use sqlx::postgres::{PgConnectOptions, PgPoolOptions};
 use sqlx::PgPool;
 use std::env;
+use std::str::FromStr;
+use std::time::Duration;
+
+/// Read a numeric setting from the environment, falling back to `default`
+pub(crate) fn env_or<T: FromStr>(key: &str, default: T) -> T {
+    env::var(key)
+        .ok()
+        .and_then(|value| value.parse().ok())
+        .unwrap_or(default)
+}
 
 pub async fn establish_connection() -> Result<PgPool, sqlx::Error> {
     let database_url = env::var("DATABASE_URL")
         .expect("DATABASE_URL must be set");
 
+    // Prepared statements kept per connection, so repeated queries skip the parse step.
+    // sqlx sends named statements even with the cache disabled, so behind PgBouncer in
+    // transaction mode it needs max_prepared_statements (1.21+), not a capacity of 0.
+    // JIT compilation only adds overhead to short OLTP queries like ours.
+    let options = database_url
+        .parse::<PgConnectOptions>()?
+        .statement_cache_capacity(env_or("DB_STATEMENT_CACHE_CAPACITY", 500))
+        .options([("jit", "off")]);
+
+    // The pool is shared by all workers of a process, so the total number of
+    // backend connections is DB_MAX_CONNECTIONS times the number of API instances.
+    // Connections are not pinged on checkout; a broken one surfaces as a query
+    // error and is dropped, while max_lifetime recycles them proactively.
     let pool = PgPoolOptions::new()
-        .max_connections(5)
-        .connect(&database_url)
+        .test_before_acquire(false)
+        .max_connections(env_or("DB_MAX_CONNECTIONS", 20))
+        .min_connections(env_or("DB_MIN_CONNECTIONS", 5))
+        .acquire_timeout(Duration::from_secs(env_or("DB_ACQUIRE_TIMEOUT_SECS", 30)))
+        .max_lifetime(Duration::from_secs(env_or("DB_MAX_LIFETIME_SECS", 3600)))
+        .connect_with(options)
         .await?;
 
     Ok(pool)
@@ -1,5 +1,5 @@
 pub mod todo;
 
 pub use todo::{
-    list_todos, get_todo, create_todo, update_todo, delete_todo,
+    list_todos, get_todo, create_todo, create_todos_bulk, update_todo, delete_todo,
 };
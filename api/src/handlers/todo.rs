@@ -1,21 +1,100 @@
-use actix_web::{web, HttpResponse};
+use actix_web::{http::header::ContentType, web, web::Bytes, HttpResponse};
 use sqlx::PgPool;
 use uuid::Uuid;
-use chrono::Utc;
 
-use crate::models::{CreateTodoRequest, UpdateTodoRequest, TodoResponse, Todo};
+use crate::models::{CreateTodoRequest, UpdateTodoRequest, TodoResponse, ListTodosQuery};
 use crate::error::ApiError;
+use crate::cache::TodoListCache;
 
-/// List all todos
-pub async fn list_todos(pool: web::Data<PgPool>) -> Result<HttpResponse, ApiError> {
-    let todos = sqlx::query_as::<_, Todo>(
-        "SELECT id, title, description, completed, created_at, updated_at FROM todos ORDER BY created_at DESC"
-    )
-    .fetch_all(pool.get_ref())
-    .await?;
+const DEFAULT_PAGE_SIZE: i64 = 50;
+const MAX_PAGE_SIZE: i64 = 100;
+const MAX_BULK_SIZE: usize = 1000;
+/// Matches the VARCHAR(255) title column
+const MAX_TITLE_LENGTH: usize = 255;
+
+/// Trim a title once and check it fits the column; the only title validation
+fn validate_title(title: &str) -> Result<&str, ApiError> {
+    let title = title.trim();
+
+    if title.is_empty() {
+        return Err(ApiError::BadRequest("Title cannot be empty".to_string()));
+    }
 
-    let response: Vec<TodoResponse> = todos.into_iter().map(|t| t.into()).collect();
-    Ok(HttpResponse::Ok().json(response))
+    if title.chars().count() > MAX_TITLE_LENGTH {
+        return Err(ApiError::BadRequest(format!(
+            "Title cannot be longer than {} characters",
+            MAX_TITLE_LENGTH
+        )));
+    }
+
+    Ok(title)
+}
+
+/// List todos, newest first, one page at a time
+pub async fn list_todos(
+    pool: web::Data<PgPool>,
+    cache: web::Data<TodoListCache>,
+    query: web::Query<ListTodosQuery>,
+) -> Result<HttpResponse, ApiError> {
+    let limit = query.limit.unwrap_or(DEFAULT_PAGE_SIZE);
+    if !(1..=MAX_PAGE_SIZE).contains(&limit) {
+        return Err(ApiError::BadRequest(format!(
+            "limit must be between 1 and {}",
+            MAX_PAGE_SIZE
+        )));
+    }
+
+    if query.before_id.is_some() && query.before.is_none() {
+        return Err(ApiError::BadRequest("before_id requires before".to_string()));
+    }
+
+    // Only first pages are cached; every client starts there
+    let cacheable = query.before.is_none();
+    let version = cache.version();
+    if cacheable {
+        if let Some(body) = cache.get(limit) {
+            return Ok(HttpResponse::Ok().content_type(ContentType::json()).body(body));
+        }
+    }
+
+    // Rows are decoded straight into the response type, no per-row conversion.
+    // Pages continue after the last (created_at, id) seen, which walks the
+    // idx_todos_created_at_id index instead of scanning past skipped rows.
+    let todos = match query.before {
+        Some(before) => {
+            sqlx::query_as::<_, TodoResponse>(
+                "SELECT id, title, description, completed, created_at, updated_at FROM todos
+                 WHERE (created_at, id) < ($1, $2)
+                 ORDER BY created_at DESC, id DESC
+                 LIMIT $3"
+            )
+            .bind(before)
+            .bind(query.before_id)
+            .bind(limit)
+            .fetch_all(pool.get_ref())
+            .await?
+        }
+        None => {
+            sqlx::query_as::<_, TodoResponse>(
+                "SELECT id, title, description, completed, created_at, updated_at FROM todos
+                 ORDER BY created_at DESC, id DESC
+                 LIMIT $1"
+            )
+            .bind(limit)
+            .fetch_all(pool.get_ref())
+            .await?
+        }
+    };
+
+    let body = serde_json::to_vec(&todos)
+        .map(Bytes::from)
+        .map_err(|e| ApiError::InternalServerError(format!("Serialization error: {}", e)))?;
+
+    if cacheable {
+        cache.store(limit, version, body.clone());
+    }
+
+    Ok(HttpResponse::Ok().content_type(ContentType::json()).body(body))
 }
 
 /// Get a single todo by ID
@@ -23,92 +102,109 @@ pub async fn get_todo(
     pool: web::Data<PgPool>,
     id: web::Path<Uuid>,
 ) -> Result<HttpResponse, ApiError> {
-    let todo = sqlx::query_as::<_, Todo>(
+    let todo = sqlx::query_as::<_, TodoResponse>(
         "SELECT id, title, description, completed, created_at, updated_at FROM todos WHERE id = $1"
     )
     .bind(id.into_inner())
     .fetch_one(pool.get_ref())
     .await?;
 
-    Ok(HttpResponse::Ok().json(TodoResponse::from(todo)))
+    Ok(HttpResponse::Ok().json(todo))
 }
 
 /// Create a new todo
 pub async fn create_todo(
     pool: web::Data<PgPool>,
+    cache: web::Data<TodoListCache>,
     req: web::Json<CreateTodoRequest>,
 ) -> Result<HttpResponse, ApiError> {
-    if req.title.trim().is_empty() {
-        return Err(ApiError::BadRequest("Title cannot be empty".to_string()));
-    }
-
-    let id = Uuid::new_v4();
-    let now = Utc::now();
+    let title = validate_title(&req.title)?;
 
-    let todo = sqlx::query_as::<_, Todo>(
-        "INSERT INTO todos (id, title, description, completed, created_at, updated_at)
-         VALUES ($1, $2, $3, $4, $5, $6)
+    // id, completed and timestamps come from the column defaults
+    let todo = sqlx::query_as::<_, TodoResponse>(
+        "INSERT INTO todos (title, description)
+         VALUES ($1, $2)
          RETURNING id, title, description, completed, created_at, updated_at"
     )
-    .bind(id)
-    .bind(&req.title)
+    .bind(title)
     .bind(&req.description)
-    .bind(false)
-    .bind(now)
-    .bind(now)
     .fetch_one(pool.get_ref())
     .await?;
 
-    Ok(HttpResponse::Created().json(TodoResponse::from(todo)))
+    cache.invalidate();
+    Ok(HttpResponse::Created().json(todo))
 }
 
-/// Update a todo
-pub async fn update_todo(
+/// Create several todos in a single statement
+pub async fn create_todos_bulk(
     pool: web::Data<PgPool>,
-    id: web::Path<Uuid>,
-    req: web::Json<UpdateTodoRequest>,
+    cache: web::Data<TodoListCache>,
+    req: web::Json<Vec<CreateTodoRequest>>,
 ) -> Result<HttpResponse, ApiError> {
-    let id = id.into_inner();
-    let now = Utc::now();
+    if req.is_empty() || req.len() > MAX_BULK_SIZE {
+        return Err(ApiError::BadRequest(format!(
+            "Between 1 and {} todos can be created at once",
+            MAX_BULK_SIZE
+        )));
+    }
 
-    // First, check if the todo exists
-    let existing = sqlx::query_as::<_, Todo>(
-        "SELECT id, title, description, completed, created_at, updated_at FROM todos WHERE id = $1"
+    let mut titles = Vec::with_capacity(req.len());
+    let mut descriptions = Vec::with_capacity(req.len());
+    for (index, todo) in req.into_inner().into_iter().enumerate() {
+        let title = validate_title(&todo.title)
+            .map_err(|err| ApiError::BadRequest(format!("todos[{}]: {}", index, err)))?;
+        titles.push(title.to_string());
+        descriptions.push(todo.description);
+    }
+
+    // UNNEST turns the two arrays into rows, so the whole batch is one INSERT
+    let todos = sqlx::query_as::<_, TodoResponse>(
+        "INSERT INTO todos (title, description)
+         SELECT * FROM UNNEST($1::text[], $2::text[])
+         RETURNING id, title, description, completed, created_at, updated_at"
     )
-    .bind(id)
-    .fetch_optional(pool.get_ref())
+    .bind(titles)
+    .bind(descriptions)
+    .fetch_all(pool.get_ref())
     .await?;
 
-    if existing.is_none() {
-        return Err(ApiError::NotFound(format!("Todo with id {} not found", id)));
-    }
-
-    let existing = existing.unwrap();
+    cache.invalidate();
+    Ok(HttpResponse::Created().json(todos))
+}
 
-    // Update fields, keeping existing values if not provided
-    let title = req.title.as_ref().unwrap_or(&existing.title).clone();
-    let description = req.description.as_ref().or(existing.description.as_ref()).cloned();
-    let completed = req.completed.unwrap_or(existing.completed);
+/// Update a todo
+pub async fn update_todo(
+    pool: web::Data<PgPool>,
+    cache: web::Data<TodoListCache>,
+    id: web::Path<Uuid>,
+    req: web::Json<UpdateTodoRequest>,
+) -> Result<HttpResponse, ApiError> {
+    let id = id.into_inner();
+    let title = req.title.as_deref().map(validate_title).transpose()?;
 
-    let todo = sqlx::query_as::<_, Todo>(
-        "UPDATE todos SET title = $1, description = $2, completed = $3, updated_at = $4
-         WHERE id = $5
+    // Update fields in a single statement, keeping existing values if not provided
+    let todo = sqlx::query_as::<_, TodoResponse>(
+        "UPDATE todos SET title = COALESCE($1, title), description = COALESCE($2, description),
+             completed = COALESCE($3, completed), updated_at = NOW()
+         WHERE id = $4
          RETURNING id, title, description, completed, created_at, updated_at"
     )
     .bind(title)
-    .bind(description)
-    .bind(completed)
-    .bind(now)
+    .bind(&req.description)
+    .bind(req.completed)
     .bind(id)
-    .fetch_one(pool.get_ref())
-    .await?;
+    .fetch_optional(pool.get_ref())
+    .await?
+    .ok_or_else(|| ApiError::NotFound(format!("Todo with id {} not found", id)))?;
 
-    Ok(HttpResponse::Ok().json(TodoResponse::from(todo)))
+    cache.invalidate();
+    Ok(HttpResponse::Ok().json(todo))
 }
 
 /// Delete a todo
 pub async fn delete_todo(
     pool: web::Data<PgPool>,
+    cache: web::Data<TodoListCache>,
     id: web::Path<Uuid>,
 ) -> Result<HttpResponse, ApiError> {
     let id = id.into_inner();
@@ -122,5 +218,6 @@ pub async fn delete_todo(
         return Err(ApiError::NotFound(format!("Todo with id {} not found", id)));
     }
 
+    cache.invalidate();
     Ok(HttpResponse::NoContent().finish())
 }
@@ -0,0 +1,100 @@
+use env_logger::{Env, Target};
+use log::{Log, Metadata, Record};
+use std::io::{self, Write};
+use std::panic;
+use std::sync::mpsc::{self, SyncSender};
+use std::thread;
+
+/// Records buffered for the writer thread before logging applies backpressure
+const LOG_QUEUE_CAPACITY: usize = 8192;
+
+enum Message {
+    Line(Vec<u8>),
+    /// Acknowledged once every line queued before it has been written
+    Flush(SyncSender<()>),
+}
+
+/// Hands formatted log records to a background thread, so request handlers
+/// never block on writing to stderr
+struct BackgroundWriter {
+    sender: SyncSender<Message>,
+}
+
+impl Write for BackgroundWriter {
+    fn write(&mut self, buf: &[u8]) -> io::Result<usize> {
+        self.sender
+            .send(Message::Line(buf.to_vec()))
+            .map_err(|_| io::Error::new(io::ErrorKind::BrokenPipe, "log writer thread stopped"))?;
+        Ok(buf.len())
+    }
+
+    // env_logger flushes its target after every record; waiting here would make
+    // each log call synchronous again, so draining is done by QueuedLogger::flush
+    fn flush(&mut self) -> io::Result<()> {
+        Ok(())
+    }
+}
+
+/// env_logger front end whose `flush` waits until the writer thread has
+/// written everything queued so far
+struct QueuedLogger {
+    inner: env_logger::Logger,
+    sender: SyncSender<Message>,
+}
+
+impl Log for QueuedLogger {
+    fn enabled(&self, metadata: &Metadata) -> bool {
+        self.inner.enabled(metadata)
+    }
+
+    fn log(&self, record: &Record) {
+        self.inner.log(record);
+    }
+
+    fn flush(&self) {
+        let (ack, done) = mpsc::sync_channel(1);
+        if self.sender.send(Message::Flush(ack)).is_ok() {
+            let _ = done.recv();
+        }
+    }
+}
+
+/// Install the logger. Output goes through a pipe target, so it is never
+/// colored, even on a terminal. Call `log::logger().flush()` before exiting
+/// so queued records are not lost; panics flush automatically.
+pub fn init() {
+    let (sender, receiver) = mpsc::sync_channel::<Message>(LOG_QUEUE_CAPACITY);
+
+    thread::Builder::new()
+        .name("log-writer".to_string())
+        .spawn(move || {
+            let mut stderr = io::stderr().lock();
+            for message in receiver {
+                match message {
+                    Message::Line(line) => {
+                        let _ = stderr.write_all(&line);
+                    }
+                    Message::Flush(ack) => {
+                        let _ = stderr.flush();
+                        let _ = ack.send(());
+                    }
+                }
+            }
+        })
+        .expect("Failed to spawn log writer thread");
+
+    let inner = env_logger::Builder::from_env(Env::default().default_filter_or("info"))
+        .target(Target::Pipe(Box::new(BackgroundWriter { sender: sender.clone() })))
+        .build();
+
+    log::set_max_level(inner.filter());
+    log::set_boxed_logger(Box::new(QueuedLogger { inner, sender }))
+        .expect("Failed to install logger");
+
+    // Write out records logged just before a panic ahead of the panic message
+    let default_hook = panic::take_hook();
+    panic::set_hook(Box::new(move |info| {
+        log::logger().flush();
+        default_hook(info);
+    }));
+}
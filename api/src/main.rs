@@ -1,33 +1,46 @@
+mod cache;
 mod db;
 mod error;
 mod handlers;
+mod logging;
 mod models;
 mod routes;
 
 use actix_web::{web, App, HttpServer, middleware};
 use actix_cors::Cors;
 use dotenv::dotenv;
-use env_logger::Env;
 use std::env;
+use std::thread;
+use std::time::Duration;
 
 #[actix_web::main]
 async fn main() -> std::io::Result<()> {
     dotenv().ok();
-    env_logger::Builder::from_env(Env::default().default_filter_or("info")).init();
+    logging::init();
 
     let database_url = env::var("DATABASE_URL").expect("DATABASE_URL must be set");
     let port = env::var("PORT").unwrap_or_else(|_| "8080".to_string());
     let addr = format!("127.0.0.1:{}", port);
+    // Zero is rejected by actix, so it falls back to one worker per CPU like an unset value
+    let workers = Some(db::env_or("WEB_CONCURRENCY", 0usize))
+        .filter(|&n| n > 0)
+        .unwrap_or_else(|| thread::available_parallelism().map_or(1, |n| n.get()));
 
     // Establish database connection
     let pool = db::establish_connection()
         .await
         .expect("Failed to create pool");
 
-    log::info!("Starting server at http://{}", addr);
+    log::info!("Starting server at http://{} with {} workers", addr, workers);
     log::info!("Connected to database: {}", database_url);
 
-    HttpServer::new(move || {
+    // Shared by every worker; each factory call only clones the Arc
+    let pool = web::Data::new(pool);
+    // Short TTL bounds staleness when several API instances share the database
+    let cache_ttl = Duration::from_secs(db::env_or("TODO_LIST_CACHE_TTL_SECS", 5));
+    let todo_list_cache = web::Data::new(cache::TodoListCache::new(cache_ttl));
+
+    let server = HttpServer::new(move || {
         // Configure CORS
         let cors = Cors::default()
             .allow_any_origin()
@@ -35,12 +48,21 @@ async fn main() -> std::io::Result<()> {
             .allow_any_header();
 
         App::new()
-            .app_data(web::Data::new(pool.clone()))
+            .app_data(pool.clone())
+            .app_data(todo_list_cache.clone())
             .wrap(cors)
             .wrap(middleware::Logger::default())
             .configure(routes::configure_routes)
     })
-    .bind(&addr)?
-    .run()
-    .await
+    .workers(workers)
+    .bind(&addr);
+
+    let result = match server {
+        Ok(server) => server.run().await,
+        Err(err) => Err(err),
+    };
+
+    // Write out records still queued for the log writer thread before exiting
+    log::logger().flush();
+    result
 }
@@ -1,3 +1,3 @@
 pub mod todo;
 
-pub use todo::{Todo, CreateTodoRequest, UpdateTodoRequest, TodoResponse};
+pub use todo::{CreateTodoRequest, UpdateTodoRequest, TodoResponse, ListTodosQuery};
@@ -2,17 +2,8 @@ use serde::{Deserialize, Serialize};
 use chrono::{DateTime, Utc};
 use uuid::Uuid;
 
-#[derive(Debug, Clone, Serialize, Deserialize, sqlx::FromRow)]
-pub struct Todo {
-    pub id: Uuid,
-    pub title: String,
-    pub description: Option<String>,
-    pub completed: bool,
-    pub created_at: DateTime<Utc>,
-    pub updated_at: DateTime<Utc>,
-}
-
-#[derive(Debug, Serialize)]
+/// A row of the `todos` table, decoded directly by every handler and returned as JSON
+#[derive(Debug, Serialize, sqlx::FromRow)]
 pub struct TodoResponse {
     pub id: Uuid,
     pub title: String,
@@ -35,15 +26,12 @@ pub struct UpdateTodoRequest {
     pub completed: Option<bool>,
 }
 
-impl From<Todo> for TodoResponse {
-    fn from(todo: Todo) -> Self {
-        TodoResponse {
-            id: todo.id,
-            title: todo.title,
-            description: todo.description,
-            completed: todo.completed,
-            created_at: todo.created_at,
-            updated_at: todo.updated_at,
-        }
-    }
+/// Keyset pagination parameters for listing todos, newest first.
+/// `before`/`before_id` are the `created_at` and `id` of the last todo of the previous page;
+/// `before_id` is only accepted together with `before`.
+#[derive(Debug, Deserialize)]
+pub struct ListTodosQuery {
+    pub limit: Option<i64>,
+    pub before: Option<DateTime<Utc>>,
+    pub before_id: Option<Uuid>,
 }
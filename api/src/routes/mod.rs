@@ -1,11 +1,21 @@
 use actix_web::web;
+use crate::error::ApiError;
 use crate::handlers;
 
 pub fn configure_routes(cfg: &mut web::ServiceConfig) {
     cfg.service(
         web::scope("/api/todos")
+            // Malformed ids are rejected while parsing the path, before any query runs
+            .app_data(web::PathConfig::default().error_handler(|_, _| {
+                ApiError::BadRequest("Invalid todo id".to_string()).into()
+            }))
+            // Malformed pagination parameters get the same JSON error body
+            .app_data(web::QueryConfig::default().error_handler(|err, _| {
+                ApiError::BadRequest(err.to_string()).into()
+            }))
             .route("", web::get().to(handlers::list_todos))
             .route("", web::post().to(handlers::create_todo))
+            .route("/bulk", web::post().to(handlers::create_todos_bulk))
             .route("/{id}", web::get().to(handlers::get_todo))
             .route("/{id}", web::put().to(handlers::update_todo))
             .route("/{id}", web::delete().to(handlers::delete_todo))
@@ -5,6 +5,7 @@
 
 // API Configuration
 const API_BASE_URL = 'http://localhost:8080/api';
+const PAGE_SIZE = 100;
 
 // State Management
 let allTodos = [];
@@ -26,6 +27,27 @@ const filterButtons = document.querySelectorAll('.btn-filter');
 // API FUNCTIONS
 // ============================================
 
+/**
+ * Send a request to the API and return the parsed JSON body (null for 204)
+ */
+async function apiRequest(method, path, errorMessage, body) {
+    const options = { method };
+
+    if (body !== undefined) {
+        options.headers = { 'Content-Type': 'application/json' };
+        options.body = JSON.stringify(body);
+    }
+
+    const response = await fetch(`${API_BASE_URL}${path}`, options);
+
+    if (!response.ok) {
+        const error = await response.json().catch(() => ({}));
+        throw new Error(error.message || `${errorMessage}: ${response.statusText}`);
+    }
+
+    return response.status === 204 ? null : response.json();
+}
+
 /**
  * Fetch all todos from the API
  */
@@ -35,13 +57,25 @@ async function fetchTodos() {
         emptyMessage.style.display = 'none';
         todosList.innerHTML = '';
 
-        const response = await fetch(`${API_BASE_URL}/todos`);
+        // The API returns todos newest first, one page at a time
+        const todos = [];
+        let cursor = '';
+
+        while (true) {
+            const page = await apiRequest(
+                'GET',
+                `/todos?limit=${PAGE_SIZE}${cursor}`,
+                'Failed to fetch todos'
+            );
+            todos.push(...page);
 
-        if (!response.ok) {
-            throw new Error(`Failed to fetch todos: ${response.statusText}`);
+            if (page.length < PAGE_SIZE) break;
+
+            const last = page[page.length - 1];
+            cursor = `&before=${encodeURIComponent(last.created_at)}&before_id=${last.id}`;
         }
 
-        allTodos = await response.json();
+        allTodos = todos;
         renderTodos();
     } catch (error) {
         console.error('Error fetching todos:', error);
@@ -54,23 +88,10 @@ async function fetchTodos() {
  */
 async function createTodo(title, description) {
     try {
-        const response = await fetch(`${API_BASE_URL}/todos`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                title: title.trim(),
-                description: description.trim() || null,
-            }),
+        const newTodo = await apiRequest('POST', '/todos', 'Failed to create todo', {
+            title: title.trim(),
+            description: description.trim() || null,
         });
-
-        if (!response.ok) {
-            const error = await response.json();
-            throw new Error(error.message || 'Failed to create todo');
-        }
-
-        const newTodo = await response.json();
         allTodos.unshift(newTodo);
         renderTodos();
         todoForm.reset();
@@ -87,20 +108,7 @@ async function createTodo(title, description) {
  */
 async function updateTodo(id, updates) {
     try {
-        const response = await fetch(`${API_BASE_URL}/todos/${id}`, {
-            method: 'PUT',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(updates),
-        });
-
-        if (!response.ok) {
-            const error = await response.json();
-            throw new Error(error.message || 'Failed to update todo');
-        }
-
-        const updatedTodo = await response.json();
+        const updatedTodo = await apiRequest('PUT', `/todos/${id}`, 'Failed to update todo', updates);
         allTodos = allTodos.map(todo => (todo.id === id ? updatedTodo : todo));
         renderTodos();
         closeEditModal();
@@ -116,14 +124,7 @@ async function updateTodo(id, updates) {
  */
 async function deleteTodo(id) {
     try {
-        const response = await fetch(`${API_BASE_URL}/todos/${id}`, {
-            method: 'DELETE',
-        });
-
-        if (!response.ok) {
-            const error = await response.json();
-            throw new Error(error.message || 'Failed to delete todo');
-        }
+        await apiRequest('DELETE', `/todos/${id}`, 'Failed to delete todo');
 
         allTodos = allTodos.filter(todo => todo.id !== id);
         renderTodos();